@@ -6,6 +6,21 @@ import time
 import re
 import json
 import os
+from functools import lru_cache
+
+# Common name variations, applied in order after punctuation is stripped
+NAME_VARIATIONS = {
+    'jimmy': 'james',
+    'jameison': 'jameson',
+    'patrick mahomes ii': 'patrick mahomes',
+    'patrick mahomes 2': 'patrick mahomes',
+    'patrick mahomes 2nd': 'patrick mahomes',
+    'patrick mahomes': 'patrick mahomes',
+    'mahomes': 'patrick mahomes',
+    'aaron jones sr': 'aaron jones',
+    'aaron jones sr.': 'aaron jones',
+    'aaron jones senior': 'aaron jones',
+}
 
 def normalize_player_name(name):
     """
@@ -21,25 +36,26 @@ def normalize_player_name(name):
     normalized = normalized.replace('.', '').replace(',', '').replace('-', ' ')
     
     # Handle common name variations
-    name_variations = {
-        'jimmy': 'james',
-        'jameison': 'jameson',
-        'patrick mahomes ii': 'patrick mahomes',
-        'patrick mahomes 2': 'patrick mahomes',
-        'patrick mahomes 2nd': 'patrick mahomes',
-        'patrick mahomes': 'patrick mahomes',
-        'mahomes': 'patrick mahomes',
-        'aaron jones sr': 'aaron jones',
-        'aaron jones sr.': 'aaron jones',
-        'aaron jones senior': 'aaron jones',
-    }
-    
-    for variation, standard in name_variations.items():
+    for variation, standard in NAME_VARIATIONS.items():
         if variation in normalized:
             normalized = normalized.replace(variation, standard)
     
     return normalized
 
+def normalize_player_name_vec(names):
+    """
+    Vectorized normalize_player_name: normalize a whole Series of names with string accessors.
+    """
+    normalized = names.astype(object).where(names.notna(), '').astype(str).str.lower().str.strip()
+    normalized = (
+        normalized.str.replace('.', '', regex=False)
+        .str.replace(',', '', regex=False)
+        .str.replace('-', ' ', regex=False)
+    )
+    for variation, standard in NAME_VARIATIONS.items():
+        normalized = normalized.str.replace(variation, standard, regex=False)
+    return normalized
+
 def get_fantasy_football_calculator_adp(league_size=12):
     """
     Get ADP data from Fantasy Football Calculator REST API.
@@ -241,9 +257,11 @@ def collect_fantasy_football_calculator_adp(league_size=12):
     print("[ERROR] Could not get Fantasy Football Calculator ADP data")
     return pd.DataFrame(columns=['player_name', 'adp'])
 
-def get_average_adp(league_size=12):
+@lru_cache(maxsize=None)
+def _load_average_adp(league_size):
     """
-    Get ADP data from Fantasy Football Calculator with configurable league size.
+    Load and normalize the ADP data once per league size; the ADP and FantasyPros
+    comparison sheets both need it during a single export.
     """
     adp_df = collect_fantasy_football_calculator_adp(league_size)
     
@@ -252,7 +270,7 @@ def get_average_adp(league_size=12):
         return pd.DataFrame(columns=['player_name', 'normalized_name', 'adp'])
     
     # Normalize player names
-    adp_df['normalized_name'] = adp_df['player_name'].apply(normalize_player_name)
+    adp_df['normalized_name'] = normalize_player_name_vec(adp_df['player_name'])
     
     # Sort by ADP
     adp_df = adp_df.sort_values('adp')
@@ -260,6 +278,13 @@ def get_average_adp(league_size=12):
     print(f"[SUCCESS] Loaded Fantasy Football Calculator ADP data: {len(adp_df)} players (league size: {league_size})")
     return adp_df[['player_name', 'normalized_name', 'adp']]
 
+def get_average_adp(league_size=12):
+    """
+    Get ADP data from Fantasy Football Calculator with configurable league size.
+    The data is fetched once per league size; each call returns its own copy.
+    """
+    return _load_average_adp(league_size).copy()
+
 def validate_adp_data(adp_df):
     """
     Validate ADP data and filter out suspicious values.
@@ -362,6 +387,39 @@ def get_value_recommendation(league_size_adjusted_diff):
     else:
         return 'Strong Avoid'
 
+# Upper bounds (inclusive) of the value tiers used by get_value_color/get_value_recommendation
+VALUE_THRESHOLDS = np.array([-0.5, -0.25, -0.10, 0.25, 0.5])
+VALUE_COLORS = np.array(['teal', 'green', 'light_green', 'white', 'yellow', 'red'], dtype=object)
+VALUE_RECOMMENDATIONS = np.array(
+    ['Strong Buy', 'Buy', 'Slight Buy', 'Neutral', 'Slight Avoid', 'Strong Avoid'], dtype=object
+)
+
+def _value_tiers(league_size_adjusted_diffs):
+    """
+    Tier index (0-5) of each difference, plus a mask of the missing ones.
+    """
+    diffs = np.asarray(league_size_adjusted_diffs, dtype=np.float64)
+    # Counting the thresholds strictly below each diff gives the first tier whose bound it is <=
+    return np.searchsorted(VALUE_THRESHOLDS, diffs, side='left'), np.isnan(diffs)
+
+def get_value_colors(league_size_adjusted_diffs):
+    """
+    Vectorized get_value_color over an array or Series of differences.
+    """
+    tiers, missing = _value_tiers(league_size_adjusted_diffs)
+    colors = VALUE_COLORS[tiers]
+    colors[missing] = 'purple'  # Missing from ADP
+    return colors
+
+def get_value_recommendations(league_size_adjusted_diffs):
+    """
+    Vectorized get_value_recommendation over an array or Series of differences.
+    """
+    tiers, missing = _value_tiers(league_size_adjusted_diffs)
+    recommendations = VALUE_RECOMMENDATIONS[tiers]
+    recommendations[missing] = 'Not in ADP'
+    return recommendations
+
 def match_players_to_adp(big_board_df, adp_df, league_size=12):
     """
     Match players from big board to ADP data and calculate value differences.
@@ -372,7 +430,7 @@ def match_players_to_adp(big_board_df, adp_df, league_size=12):
     
     # Normalize player names in big board
     big_board_df = big_board_df.copy()
-    big_board_df['normalized_name'] = big_board_df['player_id'].apply(normalize_player_name)
+    big_board_df['normalized_name'] = normalize_player_name_vec(big_board_df['player_id'])
     
     # Create a mapping from normalized names to ADP data
     adp_dict = dict(zip(clean_adp_df['normalized_name'], clean_adp_df['adp']))
@@ -472,7 +530,7 @@ def match_players_to_adp(big_board_df, adp_df, league_size=12):
     
     # Create DataFrame and sort by ADP (unmatched players go to the end)
     result_df = pd.DataFrame(all_players)
-    result_df = result_df.sort_values('adp', na_position='last')
+    result_df = result_df.sort_values('adp', na_position='last', kind='stable').reset_index(drop=True)
     
     return result_df
 
@@ -489,10 +547,10 @@ def create_adp_comparison_sheet(big_board_df, league_size=12):
     comparison_df = match_players_to_adp(big_board_df, adp_df, league_size)
     
     # Add value color and recommendation
-    comparison_df['value_color'] = comparison_df['league_size_adjusted_diff'].apply(get_value_color)
+    comparison_df['value_color'] = get_value_colors(comparison_df['league_size_adjusted_diff'])
     
     # Add value recommendation text
-    comparison_df['value_recommendation'] = comparison_df['league_size_adjusted_diff'].apply(get_value_recommendation)
+    comparison_df['value_recommendation'] = get_value_recommendations(comparison_df['league_size_adjusted_diff'])
     
     print(f"[SUCCESS] Created ADP comparison with {len(comparison_df)} players")
     print(f"[INFO] Value recommendations: {comparison_df['value_recommendation'].value_counts().to_dict()}")
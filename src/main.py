@@ -6,7 +6,7 @@ from data_collection import (
     load_nflfastr_multi_years,
     calculate_team_pace
 )
-from transformation import calculate_fantasy_points
+from transformation import calculate_fantasy_points_vec
 from weighting import injury_weight, team_context_weight
 from ranking import rank_players, export_to_excel
 from individual_optimizer import calculate_unified_big_board_score, analyze_unified_big_board_insights
@@ -176,39 +176,24 @@ if __name__ == '__main__':
     # Determine if year is in the future (no nflfastR data available)
     if int(year) > current_year:
         print(f"[INFO] {year} is in the future. Skipping nflfastR data and running projections only.")
-        results = []
-        for _, row in props_df.iterrows():
-            player_id = row['player_id']
-            team = row['team']
-            position = row.get('position', 'RB')
-            expected_games = 17
-            try:
-                raw_points = calculate_fantasy_points(row)
-            except Exception as e:
-                raw_points = 0
-            inj_weight = 1.0
-            team_weight = 1.0
-            weighted_points = raw_points
-            results.append({
-                **row,
-                'expected_games': expected_games,
-                'position': position,
-                'raw_fantasy_points': raw_points,
-                'injury_weight': inj_weight,
-                'team_weight': team_weight,
-                'weighted_fantasy_points': weighted_points,
-                'implied_points': 0,
-                'pace': 0,
-            })
-        results_df = pd.DataFrame(results)
+        # Score every player in one vectorized pass instead of row by row
+        raw_points = calculate_fantasy_points_vec(props_df)
+        results_df = props_df.assign(
+            expected_games=17,
+            position=props_df.get('position', 'RB'),
+            raw_fantasy_points=raw_points,
+            injury_weight=1.0,
+            team_weight=1.0,
+            weighted_fantasy_points=raw_points,
+            implied_points=0,
+            pace=0,
+        )
         from individual_optimizer import calculate_advanced_statistical_metrics, calculate_risk_adjusted_value, calculate_bayesian_adjustments, calculate_consistency_metrics, calculate_unified_big_board_score
-        from vbd_optimizer import calculate_replacement_baselines, calculate_vor, calculate_opportunity_cost, calculate_optimal_value
+        from vbd_optimizer import calculate_replacement_baselines, calculate_vbd_values
         from ranking import export_to_excel
         # --- VOR/Scarcity Integration ---
         baselines = calculate_replacement_baselines(results_df, league_size=league_size)
-        df_vor = calculate_vor(results_df, baselines)
-        df_oc = calculate_opportunity_cost(df_vor)
-        df_optimal = calculate_optimal_value(df_oc)
+        df_optimal = calculate_vbd_values(results_df, baselines)
         # Add VOR/scarcity columns to results_df for unified big board
         results_df = results_df.merge(df_optimal[['player_id','vor','optimal_value']], on='player_id', how='left')
         results_df['vor_final'] = results_df['vor']
@@ -235,39 +220,24 @@ if __name__ == '__main__':
             league_avg_plays = team_pace_df['plays_per_game'].mean()
             print(f'[INFO] League averages - Points: {league_avg_points:.2f}, Wins: {league_avg_wins}, Plays: {league_avg_plays:.2f}')
             avg_games_dict = calculate_expected_games(nflfastr_df, props_df)
-            results = []
-            for _, row in props_df.iterrows():
-                player_id = row['player_id']
-                team = row['team']
-                position = row.get('position', 'RB')
-                expected_games = 17
-                try:
-                    raw_points = calculate_fantasy_points(row)
-                except Exception as e:
-                    raw_points = 0
-                inj_weight = 1.0
-                team_weight = 1.0
-                weighted_points = raw_points
-                results.append({
-                    **row,
-                    'expected_games': expected_games,
-                    'position': position,
-                    'raw_fantasy_points': raw_points,
-                    'injury_weight': inj_weight,
-                    'team_weight': team_weight,
-                    'weighted_fantasy_points': weighted_points,
-                    'implied_points': 0,
-                    'pace': 0,
-                })
-            results_df = pd.DataFrame(results)
+            # Score every player in one vectorized pass instead of row by row
+            raw_points = calculate_fantasy_points_vec(props_df)
+            results_df = props_df.assign(
+                expected_games=17,
+                position=props_df.get('position', 'RB'),
+                raw_fantasy_points=raw_points,
+                injury_weight=1.0,
+                team_weight=1.0,
+                weighted_fantasy_points=raw_points,
+                implied_points=0,
+                pace=0,
+            )
             from individual_optimizer import calculate_advanced_statistical_metrics, calculate_risk_adjusted_value, calculate_bayesian_adjustments, calculate_consistency_metrics, calculate_unified_big_board_score
-            from vbd_optimizer import calculate_replacement_baselines, calculate_vor, calculate_opportunity_cost, calculate_optimal_value
+            from vbd_optimizer import calculate_replacement_baselines, calculate_vbd_values
             from ranking import export_to_excel
             # --- VOR/Scarcity Integration ---
             baselines = calculate_replacement_baselines(results_df, league_size=league_size)
-            df_vor = calculate_vor(results_df, baselines)
-            df_oc = calculate_opportunity_cost(df_vor)
-            df_optimal = calculate_optimal_value(df_oc)
+            df_optimal = calculate_vbd_values(results_df, baselines)
             # Add VOR/scarcity columns to results_df for unified big board
             results_df = results_df.merge(df_optimal[['player_id','vor','optimal_value']], on='player_id', how='left')
             results_df['vor_final'] = results_df['vor']
@@ -1,16 +1,56 @@
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill, Font
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.formatting.rule import CellIsRule
-from adp_comparison import create_adp_comparison_sheet
+from openpyxl.utils import get_column_letter
+from openpyxl.formatting.rule import FormulaRule
+from adp_comparison import (
+    create_adp_comparison_sheet, normalize_player_name_vec, get_average_adp,
+    get_value_colors, get_value_recommendations
+)
 import numpy as np
-import csv
+
+POSITIONS = ('QB', 'RB', 'WR', 'TE')
+
+# Value color fills shared by every sheet, built once at import
+_COLOR_FILLS = {
+    'teal': PatternFill(start_color='00CED1', end_color='00CED1', fill_type='solid'),
+    'green': PatternFill(start_color='32CD32', end_color='32CD32', fill_type='solid'),
+    'light_green': PatternFill(start_color='90EE90', end_color='90EE90', fill_type='solid'),
+    'white': PatternFill(start_color='FFFFFF', end_color='FFFFFF', fill_type='solid'),  # Neutral - no color
+    'yellow': PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid'),
+    'red': PatternFill(start_color='FF0000', end_color='FF0000', fill_type='solid'),
+    'purple': PatternFill(start_color='800080', end_color='800080', fill_type='solid'),
+    'black': PatternFill(start_color='000000', end_color='000000', fill_type='solid')  # For drafted players
+}
+
+# Bold header font shared by every sheet's header row
+_HEADER_FONT = Font(bold=True)
+
+# Blacks out a row once its DRAFTED column (A) is set to "YES". A single rule object is
+# shared by every sheet so the workbook carries one differential style for it.
+_DRAFTED_RULE = FormulaRule(
+    formula=['$A2="YES"'],
+    stopIfTrue=True,
+    fill=_COLOR_FILLS['black'],
+    font=Font(color='FFFFFF', bold=True)
+)
+
+def _drafted_column(n):
+    """
+    An all-"NO" DRAFTED column of length n, stored as a NO/YES categorical (one byte per row).
+    """
+    return pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=['NO', 'YES'])
 
 def rank_players(df, points_col='weighted_fantasy_points'):
-    df = df.copy()
-    df['rank'] = df[points_col].rank(ascending=False, method='min')
-    df = df.sort_values('rank')
-    return df
+    # Imported here so the Excel export side of this module does not need numba
+    from vbd_numba import _min_rank_from_sorted
+    vals = df[points_col].to_numpy(dtype=np.float64)
+    order = np.argsort(-vals, kind='stable')
+    ranks = _min_rank_from_sorted(vals[order], order)
+    ranks[np.isnan(vals)] = np.nan
+    # The argsort order is already the rank order, so reuse it rather than sorting again
+    return df.iloc[order].assign(rank=ranks[order])
 
 def export_to_excel(df, filename=None, league_size=12):
     """
@@ -25,204 +65,240 @@ def export_to_excel(df, filename=None, league_size=12):
     Export the unified big board to Excel with clean, user-friendly formatting.
     Shows ADP comparison first, then unified big board, then position-specific rankings.
     """
+    # Store low-cardinality string columns as categoricals so the position splits
+    # and sorts below compare integer codes instead of Python strings.
+    # Positions use the fixed QB/RB/WR/TE categories, keeping any others seen in the data.
+    dtypes = {}
+    if 'team' in df.columns:
+        dtypes['team'] = 'category'
+    if 'position' in df.columns:
+        extra_positions = sorted(set(df['position'].dropna()) - set(POSITIONS))
+        dtypes['position'] = pd.CategoricalDtype(categories=list(POSITIONS) + extra_positions)
+    df = df.astype(dtypes)
+
     # Select key columns for the unified big board
     columns = [
         'unified_rank', 'player_id', 'team', 'position', 'raw_fantasy_points',
         'unified_big_board_score', 'vor_final'
     ]
 
-    # Only include columns that exist in the dataframe
-    export_columns = [col for col in columns if col in df.columns]
-
-    # Add any missing columns with default values
-    for col in columns:
-        if col not in df.columns:
-            if col == 'unified_rank':
-                df[col] = df.get('rank', range(1, len(df) + 1))
-            elif col in ['unified_big_board_score', 'vor_final']:
-                df[col] = 0.0
+    # Add any missing columns with default values in a single assign
+    missing = [col for col in columns if col not in df.columns]
+    defaults = {
+        'unified_rank': df.get('rank', np.arange(1, len(df) + 1, dtype=np.int32)),
+        'unified_big_board_score': 0.0,
+        'vor_final': 0.0,
+    }
+    df = df.assign(**{col: defaults[col] for col in missing if col in defaults})
 
     # Reorder columns for export
     final_columns = [col for col in columns if col in df.columns]
-    export_df = df[final_columns].copy()
-    
-    # Add DRAFTED column first
-    export_df.insert(0, 'DRAFTED', 'NO')
-
-    # Create Excel writer
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        # Create ADP comparison sheet first (new format)
-        create_new_adp_comparison_sheet(writer, df, league_size)
-        # Create FantasyPros ADP comparison as second sheet
-        create_fantasypros_adp_comparison_sheet(writer, league_size)
-        # Write main unified big board
-        export_df.to_excel(writer, sheet_name='UNIFIED_BIG_BOARD', index=False)
-
-        # Create position-specific ranking sheets
-        create_position_sheets(writer, df)
-
-            # Auto-adjust column widths for unified big board
-    worksheet = writer.sheets['UNIFIED_BIG_BOARD']
-    for column in worksheet.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        worksheet.column_dimensions[column_letter].width = adjusted_width
-    
+    # Add the DRAFTED column and select it first; the column selection already
+    # returns a new frame, so no extra copy is needed
+    export_df = df.assign(DRAFTED=_drafted_column(len(df)))[['DRAFTED'] + final_columns]
+
+    # Compute the ADP comparison once; the sheet builders take it as a parameter
+    adp_comparison_df = create_adp_comparison_sheet(df, league_size)
+
+    # Stream every sheet into one write-only workbook, then save it once
+    workbook = Workbook(write_only=True)
+    # Create ADP comparison sheet first (new format)
+    create_new_adp_comparison_sheet(workbook, df, league_size, adp_comparison_df)
+    # Create FantasyPros ADP comparison as second sheet
+    create_fantasypros_adp_comparison_sheet(workbook, league_size)
+    # Write main unified big board
+    worksheet = _emit_sheet(workbook, export_df, 'UNIFIED_BIG_BOARD')
     # Add conditional formatting for drafted players
-    add_conditional_formatting(worksheet, len(export_df.columns))
+    add_conditional_formatting(worksheet, len(export_df.columns), len(export_df) + 1)
 
-def create_position_sheets(writer, df):
+    # Create position-specific ranking sheets
+    create_position_sheets(workbook, df)
+    # Save through a 1 MB write buffer so the zip container goes out in large writes
+    with open(filename, 'wb', buffering=1 << 20) as sink:
+        workbook.save(sink)
+
+def _set_widths(worksheet, df, number_formats=None):
+    """
+    Auto-adjust column widths to the longest value in each column, measured on the DataFrame.
+    Columns with a number format such as '0.0' are measured as they display, rounded to its decimals.
+    """
+    display = df.astype(object).where(df.notna(), '')
+    for col, number_format in (number_formats or {}).items():
+        if col in df.columns:
+            decimals = len(number_format.partition('.')[2])
+            display[col] = df[col].map(lambda v: f'{v:.{decimals}f}' if pd.notna(v) else '')
+    # Stringify the whole frame once, with missing values as empty strings, and take every
+    # column's longest value in a single vectorized pass
+    strings = display.to_numpy(dtype=str)
+    value_lengths = np.char.str_len(strings).max(axis=0, initial=0)
+    header_lengths = np.array([len(str(col)) for col in df.columns], dtype=value_lengths.dtype)
+    widths = np.minimum(np.maximum(value_lengths, header_lengths) + 2, 50)
+    for col_idx, width in enumerate(widths, start=1):
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = int(width)
+
+def _position_name_columns(positions, player_names):
+    """
+    Build the QB/WR/RB/TE sheet columns: each player's name under their position, empty elsewhere.
+    """
+    return {pos: np.where(positions == pos, player_names, '') for pos in ('QB', 'WR', 'RB', 'TE')}
+
+def _fills_by_row(value_colors):
+    """
+    Map value colors to one PatternFill (or None) per row, walking runs of consecutive
+    rows that share a color so each run is looked up and assigned once.
+    Rows without a color default to white, which is the sheet background and gets no fill,
+    so those rows are written as plain values. Fills are applied whatever the DRAFTED value;
+    the drafted-player conditional formatting takes precedence once a row is marked YES.
+    """
+    colors = value_colors.fillna('white').to_numpy()
+    fills = np.full(len(colors), None, dtype=object)
+    # Run starts are the rows whose color differs from the row above
+    starts = np.flatnonzero(np.r_[True, colors[1:] != colors[:-1]]) if len(colors) else []
+    ends = np.r_[starts[1:], len(colors)] if len(colors) else []
+    for start, end in zip(starts, ends):
+        if colors[start] != 'white':
+            fills[start:end] = _COLOR_FILLS.get(colors[start])
+    return fills
+
+def _styled_row(worksheet, row, fill, number_formats, first_fill_col):
+    """
+    Wrap a row's values in write-only cells carrying the row fill and per-column number formats.
+    """
+    cells = []
+    for col_idx, (value, number_format) in enumerate(zip(row, number_formats)):
+        cell_fill = fill if col_idx >= first_fill_col else None
+        if cell_fill is None and number_format is None:
+            # Unstyled values (such as the DRAFTED column) are appended as plain values
+            cells.append(value)
+            continue
+        cell = WriteOnlyCell(worksheet, value=value)
+        if cell_fill is not None:
+            cell.fill = cell_fill
+        if number_format is not None:
+            cell.number_format = number_format
+        cells.append(cell)
+    return cells
+
+def _emit_sheet(workbook, df, sheet_name, color_by_row=None, number_formats=None):
+    """
+    Stream df into a new write-only sheet with sized columns and optional per-row color fills.
+    color_by_row holds one PatternFill (or None for no fill) per data row.
+    number_formats maps column names to Excel display formats (e.g. '0.0').
+    Returns the worksheet so callers can add conditional formatting.
+    """
+    worksheet = workbook.create_sheet(sheet_name)
+    # Write-only sheets emit column widths with the first row, so size them up front
+    _set_widths(worksheet, df, number_formats)
+
+    header = []
+    for col in df.columns:
+        cell = WriteOnlyCell(worksheet, value=col)
+        cell.font = _HEADER_FONT
+        header.append(cell)
+    worksheet.append(header)
+
+    # Round for display only; the cells keep the full-precision values
+    col_formats = [(number_formats or {}).get(col) for col in df.columns]
+    has_formats = any(fmt is not None for fmt in col_formats)
+    if color_by_row is None:
+        color_by_row = [None] * len(df)
+    # Leave the DRAFTED column unfilled so it reads clearly against the value colors
+    first_fill_col = 1 if len(df.columns) and df.columns[0] == 'DRAFTED' else 0
+
+    # Missing values are written as empty cells, as to_excel does
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    for row, fill in zip(rows, color_by_row):
+        if fill is None and not has_formats:
+            worksheet.append(row)
+        else:
+            worksheet.append(_styled_row(worksheet, row, fill, col_formats, first_fill_col))
+    return worksheet
+
+def _prepare_pos(pos_df):
+    """
+    Build the export frame for a single position sheet from that position's players,
+    already narrowed to the sheet columns.
+    """
+    # Add DRAFTED column first, then sort by unified rank
+    pos_export_df = pos_df.assign(DRAFTED=_drafted_column(len(pos_df)))[['DRAFTED'] + list(pos_df.columns)]
+    pos_export_df = pos_export_df.sort_values('unified_rank')
+    return pos_export_df
+
+def create_position_sheets(workbook, df):
     """
     Create position-specific ranking sheets.
     """
+    if 'position' not in df.columns:
+        return
+
+    # Select key columns for position sheets
+    pos_columns = ['unified_rank', 'player_id', 'team', 'raw_fantasy_points', 'unified_big_board_score']
+    if 'vor_final' in df.columns:
+        pos_columns.append('vor_final')
+    # Only include columns that exist
+    pos_export_columns = [col for col in pos_columns if col in df.columns]
+
+    # Partition just the sheet columns by position in a single groupby pass, so each
+    # group carries only what the sheet needs; observed=True means positions with no
+    # players never produce a group
+    pos_groups = dict(iter(df[pos_export_columns].groupby(df['position'], sort=False, observed=True)))
+    positions = [pos for pos in POSITIONS if pos in pos_groups]
+
     # Position-specific rankings with key metrics
-    for pos in ['QB', 'RB', 'WR', 'TE']:
-        pos_df = df[df['position'] == pos].copy()
-        if not pos_df.empty:
-            # Select key columns for position sheets
-            pos_columns = ['unified_rank', 'player_id', 'team', 'raw_fantasy_points', 'unified_big_board_score']
-            if 'vor_final' in pos_df.columns:
-                pos_columns.append('vor_final')
-            
-            # Only include columns that exist
-            pos_export_columns = [col for col in pos_columns if col in pos_df.columns]
-            pos_export_df = pos_df[pos_export_columns].copy()
-            
-            # Add DRAFTED column first
-            pos_export_df.insert(0, 'DRAFTED', 'NO')
-            
-            # Sort by unified rank
-            pos_export_df = pos_export_df.sort_values('unified_rank')
-            
-            pos_export_df.to_excel(writer, sheet_name=f'{pos}_Rankings', index=False)
-            
-            # Auto-adjust column widths for position sheets
-            worksheet = writer.sheets[f'{pos}_Rankings']
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Add conditional formatting for drafted players
-            add_conditional_formatting(worksheet, len(pos_export_df.columns))
-
-def create_new_adp_comparison_sheet(writer, df, league_size=12):
+    for pos in positions:
+        pos_export_df = _prepare_pos(pos_groups[pos])
+        worksheet = _emit_sheet(workbook, pos_export_df, f'{pos}_Rankings')
+
+        # Add conditional formatting for drafted players
+        add_conditional_formatting(worksheet, len(pos_export_df.columns), len(pos_export_df) + 1)
+
+def create_new_adp_comparison_sheet(workbook, df, league_size=12, adp_comparison_df=None):
     """
     Create ADP comparison sheet in the new format: ADP, QB, WR, RB, TE, UNIFIED BIG BOARD RANKING, metrics
+    Rows keep the order of create_adp_comparison_sheet, which is sorted by ADP.
+    Pass adp_comparison_df to reuse an already computed comparison frame.
     """
-    # Get ADP comparison data
-    adp_comparison_df = create_adp_comparison_sheet(df, league_size)
-    
-    # Create new format DataFrame
-    new_adp_df = pd.DataFrame()
-    
-    # Add DRAFTED column first
-    new_adp_df['DRAFTED'] = 'NO'
-    
-    # Add ADP column
-    new_adp_df['ADP'] = adp_comparison_df['adp']
-    
-    # Add position columns (empty by default)
-    new_adp_df['QB'] = ''
-    new_adp_df['WR'] = ''
-    new_adp_df['RB'] = ''
-    new_adp_df['TE'] = ''
-    
-    # Fill position columns based on player position
-    for idx, row in adp_comparison_df.iterrows():
-        position = row['position']
-        player_name = row['player_id']
-        
-        if position == 'QB':
-            new_adp_df.at[idx, 'QB'] = player_name
-        elif position == 'WR':
-            new_adp_df.at[idx, 'WR'] = player_name
-        elif position == 'RB':
-            new_adp_df.at[idx, 'RB'] = player_name
-        elif position == 'TE':
-            new_adp_df.at[idx, 'TE'] = player_name
-    
-    # Add unified big board ranking
-    new_adp_df['UNIFIED BIG BOARD RANKING'] = adp_comparison_df['unified_rank']
+    # Get ADP comparison data unless the caller already has it
+    if adp_comparison_df is None:
+        adp_comparison_df = create_adp_comparison_sheet(df, league_size)
     
+    # Position columns: the player's name under their position, empty elsewhere
+    position_columns = _position_name_columns(
+        adp_comparison_df['position'].values, adp_comparison_df['player_id'].values
+    )
+
+    # Build the new format DataFrame in one constructor call from plain arrays, DRAFTED column first
+    new_columns = {
+        'DRAFTED': _drafted_column(len(adp_comparison_df)),
+        'ADP': adp_comparison_df['adp'].to_numpy(),
+        **position_columns,
+        'UNIFIED BIG BOARD RANKING': adp_comparison_df['unified_rank'].to_numpy(),
+    }
+
     # Add additional metrics
-    if 'raw_fantasy_points' in adp_comparison_df.columns:
-        new_adp_df['PROJECTED POINTS'] = adp_comparison_df['raw_fantasy_points'].round(1)
-    
-    if 'unified_big_board_score' in adp_comparison_df.columns:
-        new_adp_df['UNIFIED SCORE'] = adp_comparison_df['unified_big_board_score'].round(3)
-    
-    if 'value_recommendation' in adp_comparison_df.columns:
-        new_adp_df['VALUE RECOMMENDATION'] = adp_comparison_df['value_recommendation']
-    
-    if 'rank_difference' in adp_comparison_df.columns:
-        new_adp_df['RANK DIFFERENCE'] = adp_comparison_df['rank_difference']
-    
-    # Sort by ADP (handle NaN values)
-    new_adp_df = new_adp_df.sort_values('ADP', na_position='last')
-    
-    # Write to Excel
-    new_adp_df.to_excel(writer, sheet_name='ADP_COMPARISON', index=False)
-    
-    # Get the worksheet for formatting
-    worksheet = writer.sheets['ADP_COMPARISON']
-    
-    # Define color fills
-    color_fills = {
-        'teal': PatternFill(start_color='00CED1', end_color='00CED1', fill_type='solid'),
-        'green': PatternFill(start_color='32CD32', end_color='32CD32', fill_type='solid'),
-        'light_green': PatternFill(start_color='90EE90', end_color='90EE90', fill_type='solid'),
-        'white': PatternFill(start_color='FFFFFF', end_color='FFFFFF', fill_type='solid'),  # Neutral - no color
-        'yellow': PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid'),
-        'red': PatternFill(start_color='FF0000', end_color='FF0000', fill_type='solid'),
-        'purple': PatternFill(start_color='800080', end_color='800080', fill_type='solid'),
-        'black': PatternFill(start_color='000000', end_color='000000', fill_type='solid')  # For drafted players
+    metric_columns = {
+        'raw_fantasy_points': 'PROJECTED POINTS',
+        'unified_big_board_score': 'UNIFIED SCORE',
+        'value_recommendation': 'VALUE RECOMMENDATION',
+        'rank_difference': 'RANK DIFFERENCE',
     }
-    
-    # Apply color coding to rows based on value_color (but skip if player is drafted)
-    for row_idx, (_, player) in enumerate(adp_comparison_df.iterrows(), start=2):  # Start at 2 to skip header
-        # Check if this player is marked as drafted
-        drafted_cell = worksheet.cell(row=row_idx, column=1)  # Column A is DRAFTED
-        is_drafted = drafted_cell.value == "YES"
-        
-        if not is_drafted:  # Only apply value colors if not drafted
-            color = player.get('value_color', 'white')  # Default to white if no color
-            if color in color_fills:
-                for col_idx in range(1, len(new_adp_df.columns)):  # Exclude the DRAFTED column
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell.fill = color_fills[color]
-
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
+    for source_col, sheet_col in metric_columns.items():
+        if source_col in adp_comparison_df.columns:
+            new_columns[sheet_col] = adp_comparison_df[source_col].to_numpy()
+    new_adp_df = pd.DataFrame(new_columns)
+
+    # Color each row by its value_color
+    color_by_row = _fills_by_row(adp_comparison_df['value_color'])
+
+    # Write to Excel (adp_comparison_df is already sorted by ADP, NaN last)
+    number_formats = {col: fmt for col, fmt in (('PROJECTED POINTS', '0.0'), ('UNIFIED SCORE', '0.000'))
+                      if col in new_adp_df.columns}
+    worksheet = _emit_sheet(workbook, new_adp_df, 'ADP_COMPARISON', color_by_row, number_formats)
 
     # Add conditional formatting for drafted players
-    add_conditional_formatting(worksheet, len(new_adp_df.columns))
+    add_conditional_formatting(worksheet, len(new_adp_df.columns), len(new_adp_df) + 1)
 
-def create_fantasypros_adp_comparison_sheet(writer, league_size=12):
+def create_fantasypros_adp_comparison_sheet(workbook, league_size=12):
     """
     Create a FantasyPros ADP comparison sheet, matching FFC ADP to FantasyPros rankings.
     Only FantasyPros columns, ADP, and value columns are included (no unified big board columns).
@@ -234,139 +310,56 @@ def create_fantasypros_adp_comparison_sheet(writer, league_size=12):
     # Clean up column names
     df_fp.columns = [c.strip().replace('"', '').replace("'", '') for c in df_fp.columns]
     # Normalize player names for matching
-    from adp_comparison import normalize_player_name, get_average_adp, get_value_color, get_value_recommendation
-    df_fp['normalized_name'] = df_fp['PLAYER NAME'].apply(normalize_player_name)
-    # Get FFC ADP data
+    df_fp['normalized_name'] = normalize_player_name_vec(df_fp['PLAYER NAME'])
+    # Get FFC ADP data; get_average_adp already provides normalized names
     adp_df = get_average_adp(league_size)
-    adp_df['normalized_name'] = adp_df['player_name'].apply(normalize_player_name)
     adp_dict = dict(zip(adp_df['normalized_name'], adp_df['adp']))
-    # Build output rows
-    rows = []
-    for idx, row in df_fp.iterrows():
-        norm_name = row['normalized_name']
-        adp = adp_dict.get(norm_name, np.nan)
-        # Position columns
-        qb, wr, rb, te = '', '', '', ''
-        pos = str(row['POS']).upper().replace('"', '').replace("'", '')
-        player_name = row['PLAYER NAME']
-        if 'QB' in pos:
-            qb = player_name
-        elif 'WR' in pos:
-            wr = player_name
-        elif 'RB' in pos:
-            rb = player_name
-        elif 'TE' in pos:
-            te = player_name
-        # Value metrics (rank diff, color, recommendation)
-        try:
-            rk = float(row['RK'])
-        except Exception:
-            rk = np.nan
-        rank_difference = rk - adp if not np.isnan(adp) and not np.isnan(rk) else np.nan
-        league_size_adjusted_diff = rank_difference / league_size if not np.isnan(rank_difference) else np.nan
-        value_color = get_value_color(league_size_adjusted_diff)
-        value_recommendation = get_value_recommendation(league_size_adjusted_diff)
-        # Build row dict (NO unified big board columns)
-        out_row = {
-            'DRAFTED': 'NO',
-            'ADP': adp,
-            'QB': qb,
-            'WR': wr,
-            'RB': rb,
-            'TE': te,
-            'FANTASYPROS RANK': rk,
-            'RANK DIFFERENCE': rank_difference,
-            'VALUE RECOMMENDATION': value_recommendation,
-        }
-        # Add extra columns from FantasyPros at the end
-        for col in df_fp.columns:
-            if col not in out_row and col != 'normalized_name':
-                out_row[col] = row[col]
-        out_row['value_color'] = value_color
-        rows.append(out_row)
-    # Build DataFrame
-    out_df = pd.DataFrame(rows)
+    # Value metrics (rank diff, color, recommendation), computed column-wise
+    adp = df_fp['normalized_name'].map(adp_dict)
+    rk = pd.to_numeric(df_fp['RK'], errors='coerce')
+    rank_difference = rk - adp
+    league_size_adjusted_diff = rank_difference / league_size
+    # Position columns: bucket each POS value (e.g. "WR12") with one mask per position;
+    # np.select takes the first match, so QB wins over WR, RB and TE as before
+    pos = df_fp['POS'].astype(str).str.upper().str.replace(r'["\']', '', regex=True)
+    position_masks = [pos.str.contains(p, regex=False).to_numpy() for p in ('QB', 'WR', 'RB', 'TE')]
+    position_buckets = np.select(position_masks, ['QB', 'WR', 'RB', 'TE'], default='')
+    position_columns = _position_name_columns(position_buckets, df_fp['PLAYER NAME'].to_numpy())
+    # Build DataFrame (NO unified big board columns) in one constructor call,
+    # column by column: sheet columns first, extra FantasyPros columns at the end
+    out_columns = {
+        'DRAFTED': _drafted_column(len(df_fp)),
+        'ADP': adp,
+        **position_columns,
+        'FANTASYPROS RANK': rk,
+        'RANK DIFFERENCE': rank_difference,
+        'VALUE RECOMMENDATION': get_value_recommendations(league_size_adjusted_diff),
+    }
+    for col in df_fp.columns:
+        if col not in out_columns and col != 'normalized_name':
+            out_columns[col] = df_fp[col]
+    out_columns['value_color'] = get_value_colors(league_size_adjusted_diff)
+    out_df = pd.DataFrame(out_columns)
     # Sort by ADP (handle NaN values)
     out_df = out_df.sort_values('ADP', na_position='last')
+    # Color each row by its value_color
+    color_by_row = _fills_by_row(out_df['value_color'])
     # Write to Excel
-    out_df.to_excel(writer, sheet_name='FANTASY PROS ADP COMPARISON', index=False)
-    worksheet = writer.sheets['FANTASY PROS ADP COMPARISON']
-    # Color fills (reuse existing)
-    from openpyxl.styles import PatternFill
-    color_fills = {
-        'teal': PatternFill(start_color='00CED1', end_color='00CED1', fill_type='solid'),
-        'green': PatternFill(start_color='32CD32', end_color='32CD32', fill_type='solid'),
-        'light_green': PatternFill(start_color='90EE90', end_color='90EE90', fill_type='solid'),
-        'white': PatternFill(start_color='FFFFFF', end_color='FFFFFF', fill_type='solid'),
-        'yellow': PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid'),
-        'red': PatternFill(start_color='FF0000', end_color='FF0000', fill_type='solid'),
-        'purple': PatternFill(start_color='800080', end_color='800080', fill_type='solid'),
-        'black': PatternFill(start_color='000000', end_color='000000', fill_type='solid')
-    }
-    # Apply color coding to rows based on value_color (skip if drafted)
-    for row_idx, (_, player) in enumerate(out_df.iterrows(), start=2):
-        drafted_cell = worksheet.cell(row=row_idx, column=1)
-        is_drafted = drafted_cell.value == "YES"
-        if not is_drafted:
-            color = player.get('value_color', 'white')
-            if color in color_fills:
-                for col_idx in range(1, len(out_df.columns)):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell.fill = color_fills[color]
-    # Auto-adjust column widths
-    for column in worksheet.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        worksheet.column_dimensions[column_letter].width = adjusted_width
+    worksheet = _emit_sheet(workbook, out_df, 'FANTASY PROS ADP COMPARISON', color_by_row)
     # Add blackout formatting
-    add_conditional_formatting(worksheet, len(out_df.columns))
+    add_conditional_formatting(worksheet, len(out_df.columns), len(out_df) + 1)
 
-def add_conditional_formatting(worksheet, num_columns):
+def add_conditional_formatting(worksheet, num_columns, last_row):
     """
     Add conditional formatting to automatically black out rows when DRAFTED = "YES"
+    last_row is the sheet's last data row; write-only sheets do not track it themselves.
     """
     try:
-        last_row = worksheet.max_row
         if last_row > 1:  # Only apply if there's data
-            from openpyxl.formatting.rule import FormulaRule
-            
-            # Create a more robust formula-based rule that applies to entire rows
-            # Formula: =$A2="YES" (checks if DRAFTED column equals "YES")
-            # This will apply to the entire row when the condition is met
-            row_blackout_rule = FormulaRule(
-                formula=[f'$A2="YES"'],
-                stopIfTrue=True,
-                fill=PatternFill(start_color='000000', end_color='000000', fill_type='solid'),
-                font=Font(color='FFFFFF', bold=True)
-            )
-            
-            # Apply to the entire data range (excluding header)
-            data_range = f"A2:{chr(65 + num_columns - 1)}{last_row}"
-            worksheet.conditional_formatting.add(data_range, row_blackout_rule)
-            
-            # Add a second rule with a different approach for better compatibility
-            # This rule applies to each cell individually but checks the DRAFTED column
-            for col_idx in range(1, num_columns + 1):  # Start from 1 (column A)
-                col_letter = chr(64 + col_idx)  # A, B, C, etc.
-                col_range = f"{col_letter}2:{col_letter}{last_row}"
-                
-                # Create a rule for this specific column
-                col_rule = FormulaRule(
-                    formula=[f'$A2="YES"'],
-                    stopIfTrue=True,
-                    fill=PatternFill(start_color='000000', end_color='000000', fill_type='solid'),
-                    font=Font(color='FFFFFF', bold=True)
-                )
-                
-                worksheet.conditional_formatting.add(col_range, col_rule)
-            
+            # Apply the shared blackout rule to the entire data range (excluding header)
+            data_range = f"A2:{get_column_letter(num_columns)}{last_row}"
+            worksheet.conditional_formatting.add(data_range, _DRAFTED_RULE)
+
         print("[INFO] Conditional formatting added for drafted players (entire rows)")
         
     except Exception as e:
@@ -379,12 +372,14 @@ def add_conditional_formatting(worksheet, num_columns):
         print("5. Format: Black background, white text")
         print("6. Apply to all sheets")
 
-def create_adp_comparison_sheet_with_colors(writer, df, league_size=12):
+def create_adp_comparison_sheet_with_colors(workbook, df, league_size=12, adp_comparison_df=None):
     """
     Create ADP comparison sheet with color coding based on value differences.
+    Pass adp_comparison_df to reuse an already computed comparison frame.
     """
-    # Get ADP comparison data
-    adp_comparison_df = create_adp_comparison_sheet(df, league_size)
+    # Get ADP comparison data unless the caller already has it
+    if adp_comparison_df is None:
+        adp_comparison_df = create_adp_comparison_sheet(df, league_size)
     
     # Select columns for the ADP comparison sheet
     adp_columns = [
@@ -395,47 +390,10 @@ def create_adp_comparison_sheet_with_colors(writer, df, league_size=12):
     
     # Only include columns that exist
     adp_export_columns = [col for col in adp_columns if col in adp_comparison_df.columns]
-    adp_export_df = adp_comparison_df[adp_export_columns].copy()
+    adp_export_df = adp_comparison_df[adp_export_columns]
     
+    # Color each row by its value_color
+    color_by_row = _fills_by_row(adp_comparison_df['value_color'])
+
     # Write to Excel
-    adp_export_df.to_excel(writer, sheet_name='ADP_Comparison', index=False)
-    
-    # Get the worksheet for formatting
-    worksheet = writer.sheets['ADP_Comparison']
-    
-    # Define color fills
-    color_fills = {
-        'teal': PatternFill(start_color='00CED1', end_color='00CED1', fill_type='solid'),
-        'green': PatternFill(start_color='32CD32', end_color='32CD32', fill_type='solid'),
-        'light_green': PatternFill(start_color='90EE90', end_color='90EE90', fill_type='solid'),
-        'white': PatternFill(start_color='FFFFFF', end_color='FFFFFF', fill_type='solid'),  # Neutral - no color
-        'yellow': PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid'),
-        'red': PatternFill(start_color='FF0000', end_color='FF0000', fill_type='solid'),
-        'purple': PatternFill(start_color='800080', end_color='800080', fill_type='solid')
-    }
-    
-    # Apply color coding to rows based on value_color (but skip if player is drafted)
-    for row_idx, (_, player) in enumerate(adp_comparison_df.iterrows(), start=2):  # Start at 2 to skip header
-        # Check if this player is marked as drafted
-        drafted_cell = worksheet.cell(row=row_idx, column=1)  # Column A is DRAFTED
-        is_drafted = drafted_cell.value == "YES"
-        
-        if not is_drafted:  # Only apply value colors if not drafted
-            color = player.get('value_color', 'white')  # Default to white if no color
-            if color in color_fills:
-                for col_idx in range(1, len(adp_export_columns) + 1):
-                    cell = worksheet.cell(row=row_idx, column=col_idx)
-                    cell.fill = color_fills[color]
-    
-    # Auto-adjust column widths
-    for column in worksheet.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        worksheet.column_dimensions[column_letter].width = adjusted_width 
\ No newline at end of file
+    _emit_sheet(workbook, adp_export_df, 'ADP_Comparison', color_by_row)
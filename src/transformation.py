@@ -16,12 +16,47 @@ def calculate_fantasy_points(row):
         row.get('ints', 0) * -2  # Interception penalty
     )
 
+def calculate_fantasy_points_vec(df):
+    """
+    Vectorized calculate_fantasy_points: full PPR fantasy points for every row of df at once.
+    Missing stat columns count as 0, as in the row-wise version.
+    """
+    def stat(col):
+        return df[col] if col in df.columns else 0
+
+    return (
+        stat('rushing_yds') * 0.1 +
+        stat('rushing_tds') * 6 +
+        stat('receptions') * 1 +
+        stat('receiving_yds') * 0.1 +
+        stat('receiving_tds') * 6 +
+        stat('passing_yds') * 0.04 +
+        stat('passing_tds') * 4 +
+        stat('ints') * -2  # Interception penalty
+    )
+
+def build_player_availability_index(nflfastr_df):
+    """
+    Map every player_id to (games_played, age, position) in one grouped pass over nflfastR data,
+    for callers that look up many players; unknown players should default to (0, None, None).
+    Age and position come from each player's first row, as in extract_player_availability.
+    """
+    players = nflfastr_df.dropna(subset=['player_id'])
+    first_rows = players.drop_duplicates('player_id').set_index('player_id')
+    games_played = players.groupby('player_id')['game_id'].nunique().reindex(first_rows.index)
+    return dict(zip(
+        first_rows.index,
+        zip(games_played.tolist(), first_rows['age'].to_numpy(), first_rows['position'].to_numpy())
+    ))
+
 def extract_player_availability(nflfastr_df, player_id):
     """
     Returns games played, age, and position for a given player_id from nflfastR data.
+    To look up many players, build the index once with build_player_availability_index
+    and read players from it directly instead of calling this per player.
     """
     player_data = nflfastr_df[nflfastr_df['player_id'] == player_id]
     games_played = player_data['game_id'].nunique()
     age = player_data['age'].iloc[0] if not player_data.empty else None
     position = player_data['position'].iloc[0] if not player_data.empty else None
-    return games_played, age, position 
\ No newline at end of file
+    return games_played, age, position
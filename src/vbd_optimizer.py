@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from vbd_numba import _vbd_core, _vor, _opportunity_cost, _optimal_value
 
 def calculate_replacement_baselines(df, league_size=12):
     """
@@ -12,39 +13,61 @@ def calculate_replacement_baselines(df, league_size=12):
     # RB: 2 per team
     # WR: 2 per team
     # TE: 1 per team
-    qb_idx = league_size - 1
-    rb_idx = 2 * league_size - 1
-    wr_idx = 2 * league_size - 1
-    te_idx = league_size - 1
-    for position in ['QB', 'RB', 'WR', 'TE']:
-        pos_df = df[df['position'] == position].sort_values('raw_fantasy_points', ascending=False)
-        if position == 'QB':
-            baseline_idx = qb_idx
-        elif position == 'RB':
-            baseline_idx = rb_idx
-        elif position == 'WR':
-            baseline_idx = wr_idx
-        elif position == 'TE':
-            baseline_idx = te_idx
-        if len(pos_df) > baseline_idx:
-            baselines[position] = pos_df.iloc[baseline_idx]['raw_fantasy_points']
+    baseline_idxs = {
+        'QB': league_size - 1,
+        'RB': 2 * league_size - 1,
+        'WR': 2 * league_size - 1,
+        'TE': league_size - 1,
+    }
+    # Split the points by position in a single groupby pass
+    points_by_position = dict(iter(df.groupby('position', sort=False, observed=True)['raw_fantasy_points']))
+    for position, baseline_idx in baseline_idxs.items():
+        points = points_by_position.get(position, pd.Series(dtype=float))
+        if len(points) > baseline_idx:
+            # Best first, missing values last, as sort_values(ascending=False) orders them
+            baselines[position] = -np.sort(-points.to_numpy(dtype=float))[baseline_idx]
         else:
             # Fallback: use median if not enough players
-            baselines[position] = pos_df['raw_fantasy_points'].median()
+            baselines[position] = points.median()
     return baselines
 
+def _position_codes(df):
+    """
+    Position codes 0-3 for QB/RB/WR/TE, indexing the per-position baseline array; other positions get -1.
+    """
+    return pd.Categorical(df['position'], categories=['QB', 'RB', 'WR', 'TE']).codes
+
+def _baselines_by_pos(baselines):
+    """
+    Replacement baselines as an array in position-code order.
+    """
+    return np.array([baselines.get(position, 0) for position in ['QB', 'RB', 'WR', 'TE']], dtype=np.float64)
+
+def _add_vbd_inplace(df, baselines, vor_weight=0.7, oc_weight=0.3):
+    """
+    Add the VOR, opportunity cost and optimal value columns to df in place, in one compiled pass.
+    """
+    points = df['raw_fantasy_points'].to_numpy(dtype=np.float64)
+    pos_codes = _position_codes(df)
+    # Players by position, best first (missing points last), for the opportunity cost drop-offs
+    order = np.lexsort((-points, pos_codes))
+
+    vor, oc, vor_normalized, oc_normalized, optimal_value = _vbd_core(
+        points, pos_codes, order, _baselines_by_pos(baselines), vor_weight, oc_weight
+    )
+    df['vor'] = vor
+    df['opportunity_cost'] = oc
+    df['vor_normalized'] = vor_normalized
+    df['oc_normalized'] = oc_normalized
+    df['optimal_value'] = optimal_value
+
 def calculate_vor(df, baselines):
     """
     Calculate Value Over Replacement (VOR) for each player.
     """
     df_vor = df.copy()
-    df_vor['vor'] = 0.0
-    
-    for position in ['QB', 'RB', 'WR', 'TE']:
-        pos_mask = df_vor['position'] == position
-        baseline = baselines.get(position, 0)
-        df_vor.loc[pos_mask, 'vor'] = df_vor.loc[pos_mask, 'raw_fantasy_points'] - baseline
-    
+    points = df_vor['raw_fantasy_points'].to_numpy(dtype=np.float64)
+    df_vor['vor'] = _vor(points, _position_codes(df_vor), _baselines_by_pos(baselines))
     return df_vor
 
 def calculate_opportunity_cost(df_vor):
@@ -52,22 +75,11 @@ def calculate_opportunity_cost(df_vor):
     Calculate opportunity cost based on positional scarcity.
     """
     df_oc = df_vor.copy()
-    df_oc['opportunity_cost'] = 0.0
-    
-    for position in ['QB', 'RB', 'WR', 'TE']:
-        pos_df = df_oc[df_oc['position'] == position].sort_values('vor', ascending=False)
-        
-        if len(pos_df) > 1:
-            # Calculate drop-off to next best player at same position
-            for i in range(len(pos_df) - 1):
-                current_vor = pos_df.iloc[i]['vor']
-                next_vor = pos_df.iloc[i + 1]['vor']
-                drop_off = current_vor - next_vor
-                
-                # Set opportunity cost for current player
-                player_idx = pos_df.index[i]
-                df_oc.loc[player_idx, 'opportunity_cost'] = drop_off
-    
+    vor = df_oc['vor'].to_numpy(dtype=np.float64)
+    pos_codes = _position_codes(df_oc)
+    # Players by position, best VOR first (missing last)
+    order = np.lexsort((-vor, pos_codes))
+    df_oc['opportunity_cost'] = _opportunity_cost(vor, pos_codes, order)
     return df_oc
 
 def calculate_optimal_value(df_oc, vor_weight=0.7, oc_weight=0.3):
@@ -75,41 +87,48 @@ def calculate_optimal_value(df_oc, vor_weight=0.7, oc_weight=0.3):
     Calculate optimal value score combining VOR and opportunity cost.
     """
     df_optimal = df_oc.copy()
-    
-    # Normalize VOR and opportunity cost to 0-1 scale
-    df_optimal['vor_normalized'] = (df_optimal['vor'] - df_optimal['vor'].min()) / (df_optimal['vor'].max() - df_optimal['vor'].min())
-    df_optimal['oc_normalized'] = (df_optimal['opportunity_cost'] - df_optimal['opportunity_cost'].min()) / (df_optimal['opportunity_cost'].max() - df_optimal['opportunity_cost'].min())
-    
-    # Calculate optimal value score
-    df_optimal['optimal_value'] = (
-        df_optimal['vor_normalized'] * vor_weight + 
-        df_optimal['oc_normalized'] * oc_weight
+    vor_normalized, oc_normalized, optimal_value = _optimal_value(
+        df_optimal['vor'].to_numpy(dtype=np.float64),
+        df_optimal['opportunity_cost'].to_numpy(dtype=np.float64),
+        vor_weight, oc_weight
     )
-    
+    df_optimal['vor_normalized'] = vor_normalized
+    df_optimal['oc_normalized'] = oc_normalized
+    df_optimal['optimal_value'] = optimal_value
+    return df_optimal
+
+def calculate_vbd_values(df, baselines, vor_weight=0.7, oc_weight=0.3):
+    """
+    Calculate VOR, opportunity cost and optimal value in one compiled pass.
+    Same columns and values as chaining calculate_vor, calculate_opportunity_cost
+    and calculate_optimal_value, with a single copy of df.
+    """
+    df_optimal = df.copy()
+    _add_vbd_inplace(df_optimal, baselines, vor_weight, oc_weight)
     return df_optimal
 
 def optimize_big_board(df):
     """
     Optimize big board using Value-Based Drafting principles.
+    The input frame is copied once and every column is added to that copy.
     """
+    df_optimal = df.copy()
+    # Store position as a categorical so the position splits and masks below compare
+    # integer codes; any positions beyond QB/RB/WR/TE are kept as extra categories
+    positions = ['QB', 'RB', 'WR', 'TE']
+    extra_positions = sorted(set(df_optimal['position'].dropna()) - set(positions))
+    df_optimal['position'] = df_optimal['position'].astype(pd.CategoricalDtype(categories=positions + extra_positions))
+
     print("[INFO] Calculating replacement baselines...")
-    baselines = calculate_replacement_baselines(df)
+    baselines = calculate_replacement_baselines(df_optimal)
     print(f"Replacement Baselines: {baselines}")
     
-    print("[INFO] Calculating Value Over Replacement (VOR)...")
-    df_vor = calculate_vor(df, baselines)
-    
-    print("[INFO] Calculating opportunity cost...")
-    df_oc = calculate_opportunity_cost(df_vor)
-    
-    print("[INFO] Calculating optimal value scores...")
-    df_optimal = calculate_optimal_value(df_oc)
+    print("[INFO] Calculating VOR, opportunity cost and optimal value scores...")
+    _add_vbd_inplace(df_optimal, baselines)
     
     # Rank by optimal value
     df_optimal['vbd_rank'] = df_optimal['optimal_value'].rank(ascending=False, method='min')
-    df_optimal = df_optimal.sort_values('vbd_rank')
-    
-    return df_optimal
+    return df_optimal.sort_values('vbd_rank')
 
 def analyze_positional_scarcity(df_optimal):
     """
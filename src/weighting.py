@@ -1,33 +1,69 @@
-def injury_weight(games_played, age, position):
+import numpy as np
+
+# Injury/availability parameters
+GAMES_PER_SEASON = 17.0
+INJURY_AGE_CUTOFFS = {'RB': 28, 'WR': 30}  # Age at which the position's age penalty starts
+INJURY_AGE_PENALTY = 0.95
+
+# Team context parameters
+TEAM_ALPHA = 0.03  # Implied points (per TD above avg)
+TEAM_GAMMA = 0.01  # Pace (per 2 plays above avg)
+TEAM_BETA_BY_POSITION = {'RB': 0.01, 'WR': -0.01, 'QB': -0.01, 'TE': -0.01}  # Win total; other positions 0
+
+def _injury_weight(games_played, aging):
     """
-    Calculate injury/availability weight based on games played, age, and position.
+    Shared injury weight formula; works on scalars and arrays alike.
     """
-    games_weight = games_played / 17.0
-    age_penalty = 1.0
-    if position in ['RB', 'WR']:
-        if (position == 'RB' and age is not None and age >= 28) or (position == 'WR' and age is not None and age >= 30):
-            age_penalty = 0.95
-    return games_weight * age_penalty
+    return (games_played / GAMES_PER_SEASON) * np.where(aging, INJURY_AGE_PENALTY, 1.0)
 
-def team_context_weight(implied_points, league_avg_points, win_total, league_avg_wins, pace, league_avg_plays, position):
+def _team_context_weight(implied_points, league_avg_points, win_total, league_avg_wins, pace, league_avg_plays, beta):
     """
-    Calculate team context weight using best-practice parameters and position-specific logic.
+    Shared team context formula; works on scalars and arrays alike.
     """
-    alpha = 0.03  # Implied points (per TD above avg)
-    gamma = 0.01  # Pace (per 2 plays above avg)
-    # Position-specific beta
-    if position == 'RB':
-        beta = 0.01
-    elif position in ['WR', 'QB', 'TE']:
-        beta = -0.01
-    else:
-        beta = 0.0
     # Avoid division by zero
     league_avg_points = league_avg_points or 1
     league_avg_wins = league_avg_wins or 1
     league_avg_plays = league_avg_plays or 1
     # Calculate weight
-    implied_points_component = 1 + alpha * ((implied_points - league_avg_points) / 7)
+    implied_points_component = 1 + TEAM_ALPHA * ((implied_points - league_avg_points) / 7)
     win_total_component = 1 + beta * (win_total - league_avg_wins)
-    pace_component = 1 + gamma * ((pace - league_avg_plays) / 2)
-    return implied_points_component * win_total_component * pace_component 
\ No newline at end of file
+    pace_component = 1 + TEAM_GAMMA * ((pace - league_avg_plays) / 2)
+    return implied_points_component * win_total_component * pace_component
+
+def injury_weight(games_played, age, position):
+    """
+    Calculate injury/availability weight based on games played, age, and position.
+    """
+    cutoff = INJURY_AGE_CUTOFFS.get(position)
+    aging = cutoff is not None and age is not None and age >= cutoff
+    return float(_injury_weight(games_played, aging))
+
+def injury_weight_vec(games_played, age, position):
+    """
+    Vectorized injury_weight over arrays or Series of games played, ages and positions.
+    Missing ages get no age penalty.
+    """
+    position = np.asarray(position, dtype=object)
+    age = np.asarray(age, dtype=np.float64)
+    aging = np.zeros(position.shape, dtype=bool)
+    for pos, cutoff in INJURY_AGE_CUTOFFS.items():
+        aging |= (position == pos) & (age >= cutoff)
+    return _injury_weight(games_played, aging)
+
+def team_context_weight(implied_points, league_avg_points, win_total, league_avg_wins, pace, league_avg_plays, position):
+    """
+    Calculate team context weight using best-practice parameters and position-specific logic.
+    """
+    beta = TEAM_BETA_BY_POSITION.get(position, 0.0)
+    return _team_context_weight(implied_points, league_avg_points, win_total, league_avg_wins, pace, league_avg_plays, beta)
+
+def team_context_weight_vec(implied_points, league_avg_points, win_total, league_avg_wins, pace, league_avg_plays, position):
+    """
+    Vectorized team_context_weight: the per-player inputs are arrays or Series, the league
+    averages are scalars.
+    """
+    position = np.asarray(position, dtype=object)
+    beta = np.zeros(position.shape, dtype=np.float64)
+    for pos, pos_beta in TEAM_BETA_BY_POSITION.items():
+        beta[position == pos] = pos_beta
+    return _team_context_weight(implied_points, league_avg_points, win_total, league_avg_wins, pace, league_avg_plays, beta)